@@ -0,0 +1,6 @@
+# gamesweeper.py
+# Entry point: python gamesweeper.py run|bench|replay|train [...]
+from src.cli import main
+
+if __name__ == "__main__":
+    main()
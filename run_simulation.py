@@ -82,7 +82,7 @@ def run_ai_game(width=5, height=5, mines=5, max_steps=50, learning_mgr=None, gam
     # Record outcome for learning
     outcome = "win" if gm.is_victory() else "lose"
     if learning_mgr:
-        learning_mgr.record_game(game_key, step_records, outcome)
+        learning_mgr.record_game(game_key, step_records, outcome, board)
 
     return gm.is_victory()
 
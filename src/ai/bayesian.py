@@ -2,8 +2,14 @@
 import itertools
 
 class BayesianAnalyzer:
-    def __init__(self):
-        pass
+    def __init__(self, max_frontier=None):
+        """
+        max_frontier: enumeration is exponential in the number of constrained
+        cells; above this many, compute_probabilities() falls back to a local
+        estimate (the highest mines-needed / hidden-neighbours ratio among a
+        cell's clues, as FrontierSolver uses). None always enumerates.
+        """
+        self.max_frontier = max_frontier
 
     def compute_probabilities(self, board):
         # Return a dict: {(x, y): probability_of_mine}
@@ -48,11 +54,14 @@ class BayesianAnalyzer:
         # For cells not in constraints, fallback to uniform
         fallback_prob_cells = [(c.x, c.y) for c in unrevealed_cells if (c.x, c.y) not in relevant_cells]
 
+        flagged_mines = sum(1 for row in board.grid for c in row if c.flagged)
+        if self.max_frontier is not None and len(relevant_cells) > self.max_frontier:
+            return self._local_estimate(board, constraints, fallback_prob_cells, flagged_mines, len(unrevealed_cells))
+
         # 3. Enumerate possible ways to assign mines to these relevant cells consistent with constraints
         relevant_list = list(relevant_cells)
         # If it's huge, enumeration can be slow, but on a small board it's feasible
         assignments = []
-        flagged_mines = sum(1 for row in board.grid for c in row if c.flagged)
         total_mines_left = board.mines - flagged_mines
         # We can try all subsets of relevant_list of size up to total_mines_left.
         # But for demonstration, let's just generate all subsets of relevant_list.
@@ -97,6 +106,18 @@ class BayesianAnalyzer:
 
         return prob_dict
 
+    def _local_estimate(self, board, constraints, fallback_prob_cells, flagged_mines, num_unrevealed):
+        prob_dict = {}
+        for (neighbors, mines_needed) in constraints:
+            ratio = mines_needed / float(len(neighbors))
+            for n in neighbors:
+                key = (n.x, n.y)
+                prob_dict[key] = max(prob_dict.get(key, 0.0), ratio)
+        uniform_prob = max(0.0, min(1.0, (board.mines - flagged_mines) / float(num_unrevealed)))
+        for fc in fallback_prob_cells:
+            prob_dict[fc] = uniform_prob
+        return prob_dict
+
     def _check_constraints(self, constraints, combo):
         # combo is a set of (x, y) that have mines
         # For each constraint (neighbors, mines_needed):
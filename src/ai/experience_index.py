@@ -0,0 +1,175 @@
+# src/ai/experience_index.py
+import hashlib
+import mmap
+import struct
+
+from .learning_manager import LearningManager
+
+# Immutable open-addressing hash table of aggregated (state, action) stats.
+#   header | slots (fingerprint, first action, action count) | actions
+# A state's fingerprint is 8 bytes of blake2b over the game key and the
+# sorted flagged/revealed positions, so it is identical in every process
+# (unlike hash()). Fingerprint 0 marks an empty slot; lookups use linear
+# probing. A fingerprint collision between two states is possible in
+# theory (~n^2 / 2^64) and ignored.
+MAGIC = b'GSXI'
+VERSION = 1
+HEADER = struct.Struct('<4sHHII')  # magic, version, reserved, num_slots, num_actions
+SLOT = struct.Struct('<QII')       # fingerprint, action offset, action count
+ACTION = struct.Struct('<BxHHII')  # action type, x, y, wins, losses
+ACTION_TYPES = ("reveal", "flag")
+
+
+def state_fingerprint(game_key, state_hash):
+    """state_hash: (flagged, revealed) as frozensets of tuples or as lists loaded from JSON."""
+    flagged = sorted(tuple(p) for p in state_hash[0])
+    revealed = sorted(tuple(p) for p in state_hash[1])
+    key = f"{game_key}|{flagged}|{revealed}".encode()
+    fp = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little')
+    return fp or 1  # 0 is reserved for empty slots
+
+
+def _iter_records(data):
+    if isinstance(data, dict):
+        return ((game_key, record) for game_key, records in data.items() for record in records)
+    return data
+
+
+def aggregate_experience(data):
+    """
+    Collapse experience into {fingerprint: {(act_type, x, y): [wins, losses]}}.
+    data: LearningManager.data, or an iterable of (game_key, record) such as
+    policy.iter_records(filename).
+    """
+    stats = {}
+    for game_key, record in _iter_records(data):
+        won = record["outcome"] == "win"
+        for state_hash, action in record["steps"]:
+            fp = state_fingerprint(game_key, state_hash)
+            actions = stats.setdefault(fp, {})
+            counts = actions.setdefault(tuple(action), [0, 0])
+            counts[0 if won else 1] += 1
+    return stats
+
+
+def build_index(data, filename):
+    """Write the aggregated statistics of `data` (see aggregate_experience) to an index file."""
+    stats = aggregate_experience(data)
+    num_slots = 1
+    while num_slots < 2 * len(stats):  # load factor <= 0.5 keeps probe chains short
+        num_slots *= 2
+    slots = [(0, 0, 0)] * num_slots
+    actions = []
+    for fp, state_actions in stats.items():
+        i = fp & (num_slots - 1)
+        while slots[i][0] != 0:
+            i = (i + 1) & (num_slots - 1)
+        slots[i] = (fp, len(actions), len(state_actions))
+        for (act_type, x, y), (wins, losses) in state_actions.items():
+            actions.append((ACTION_TYPES.index(act_type), x, y, wins, losses))
+
+    with open(filename, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, num_slots, len(actions)))
+        for slot in slots:
+            f.write(SLOT.pack(*slot))
+        for action in actions:
+            f.write(ACTION.pack(*action))
+
+
+class ExperienceIndex:
+    """
+    Read-only, memory-mapped experience statistics.
+
+    Every worker opens the same file; the mapping is shared by the OS, so
+    memory does not grow with the number of workers and nothing is parsed at
+    startup. best_action_for_state() matches LearningManager's, so it can be
+    used wherever a learning manager is only queried.
+    """
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.num_slots, self.num_actions = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{filename} is not a GameSweeper experience index (version {VERSION})")
+        self._actions_start = HEADER.size + self.num_slots * SLOT.size
+
+    def __len__(self):
+        return self.num_actions
+
+    def lookup(self, game_key, state_hash):
+        """Returns [((act_type, x, y), wins, losses), ...] for the state, or []."""
+        fp = state_fingerprint(game_key, state_hash)
+        mask = self.num_slots - 1
+        i = fp & mask
+        while True:
+            slot_fp, offset, count = SLOT.unpack_from(self._mmap, HEADER.size + i * SLOT.size)
+            if slot_fp == 0:
+                return []
+            if slot_fp == fp:
+                break
+            i = (i + 1) & mask
+        results = []
+        for k in range(offset, offset + count):
+            act, x, y, wins, losses = ACTION.unpack_from(self._mmap, self._actions_start + k * ACTION.size)
+            results.append(((ACTION_TYPES[act], x, y), wins, losses))
+        return results
+
+    def best_action_for_state(self, game_key, state_hash):
+        """Same scoring as LearningManager: +1 per win, -1 per loss; None if unseen."""
+        best_act, best_score = None, None
+        for action, wins, losses in self.lookup(game_key, state_hash):
+            score = wins - losses
+            if best_score is None or score > best_score:
+                best_act, best_score = action, score
+        return best_act
+
+    def close(self):
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class WorkerExperience:
+    """
+    Learning manager for one worker process: looks actions up in the shared
+    index and records new games into its own experience file, which is merged
+    into the main store with merge_worker_experience() after the run.
+    Can be passed as learning_mgr to the game runners.
+    """
+    def __init__(self, index_filename, worker_filename):
+        self.index = ExperienceIndex(index_filename)
+        self.local = LearningManager(worker_filename)
+
+    def best_action_for_state(self, game_key, state_hash):
+        return self.index.best_action_for_state(game_key, state_hash)
+
+    def record_game(self, game_key, actions, outcome, board=None):
+        self.local.record_game(game_key, actions, outcome, board)
+
+    def save_experience(self):
+        self.local.save_experience()
+
+    def close(self):
+        self.index.close()
+
+
+def merge_worker_experience(experience_filename, worker_filenames, index_filename=None):
+    """
+    Append every worker's recorded games to the main experience file and,
+    if index_filename is given, rebuild the shared index from the result.
+    """
+    main = LearningManager(experience_filename)
+    for worker_filename in worker_filenames:
+        main.merge(LearningManager(worker_filename).data)
+    main.save_experience()
+    if index_filename:
+        build_index(main.data, index_filename)
+    return main
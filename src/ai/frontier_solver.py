@@ -0,0 +1,55 @@
+# src/ai/frontier_solver.py
+class FrontierSolver:
+    """
+    Solver for ChunkedBoard that only looks at board.boundary_cells(), so its
+    cost follows the frontier instead of width x height.
+
+    Forced moves use the same single-clue rules as PatternSolver. Probabilities
+    are a local estimate: each hidden frontier cell gets the highest
+    (mines still needed / hidden neighbours) ratio among its clues, not the
+    exact enumeration BayesianAnalyzer does on small boards.
+    """
+    def find_forced_moves(self, board):
+        forced_moves = {}  # dict keeps the order and drops duplicates
+        for cell in board.boundary_cells():
+            neighbors = board.get_neighbors(cell.x, cell.y)
+            flagged = [n for n in neighbors if n.flagged]
+            unrevealed = [n for n in neighbors if not n.revealed and not n.flagged]
+            mines_needed = cell.neighbor_mines - len(flagged)
+            if unrevealed and mines_needed == len(unrevealed):
+                for n in unrevealed:
+                    forced_moves[("flag", n.x, n.y)] = True
+            elif unrevealed and mines_needed == 0:
+                for n in unrevealed:
+                    forced_moves[("reveal", n.x, n.y)] = True
+        return list(forced_moves)
+
+    def compute_probabilities(self, board):
+        # Return a dict: {(x, y): probability_of_mine} for hidden frontier cells
+        probabilities = {}
+        for cell in board.boundary_cells():
+            neighbors = board.get_neighbors(cell.x, cell.y)
+            unrevealed = [n for n in neighbors if not n.revealed and not n.flagged]
+            if not unrevealed:
+                continue
+            mines_needed = cell.neighbor_mines - sum(1 for n in neighbors if n.flagged)
+            ratio = max(0.0, min(1.0, mines_needed / len(unrevealed)))
+            for n in unrevealed:
+                key = (n.x, n.y)
+                probabilities[key] = max(probabilities.get(key, 0.0), ratio)
+        return probabilities
+
+    def guess(self, board, probabilities):
+        """
+        Reveal the safest frontier cell, or a hidden cell off the frontier
+        (mine chance ~ board.density) when that is safer or there is no frontier.
+        """
+        best = min(probabilities, key=probabilities.get) if probabilities else None
+        if best is not None and probabilities[best] <= board.density:
+            return ("reveal", best[0], best[1])
+        for c in board.get_unrevealed_cells():
+            if (c.x, c.y) not in probabilities:
+                return ("reveal", c.x, c.y)
+        if best is not None:
+            return ("reveal", best[0], best[1])
+        return None
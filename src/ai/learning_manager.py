@@ -15,29 +15,54 @@ class LearningManager:
         except (FileNotFoundError, json.JSONDecodeError):
             return {}
     
+    @staticmethod
+    def _serializer(obj):
+        if isinstance(obj, frozenset):
+            return list(obj)  # Convert frozenset to list
+        raise TypeError(f"Type {type(obj)} not serializable")
+
     def save_experience(self):
-        def custom_serializer(obj):
-            if isinstance(obj, frozenset):
-                return list(obj)  # Convert frozenset to list
-            raise TypeError(f"Type {type(obj)} not serializable")
-        
         with open(self.filename, 'w') as f:
-            json.dump(self.data, f, indent=2, default=custom_serializer)
+            json.dump(self.data, f, indent=2, default=self._serializer)
+
+    def export_jsonl(self, filename):
+        """
+        Write one {"game_key": ..., **record} object per line, the format
+        policy.iter_records() streams without loading the whole store.
+        """
+        with open(filename, 'w') as f:
+            for game_key, records in self.data.items():
+                for record in records:
+                    f.write(json.dumps({"game_key": game_key, **record}, default=self._serializer) + '\n')
 
 
-    def record_game(self, game_key, actions, outcome):
+    def record_game(self, game_key, actions, outcome, board=None):
         """
         game_key: a simple string describing the game config, e.g. '5x5_5mines'
         actions: list of (state_hash, action) describing each step
         outcome: 'win' or 'lose'
+        board: optional Board the game was played on; its size and mine layout
+               are stored so offline training can rebuild the clues of each step
         """
         if game_key not in self.data:
             self.data[game_key] = []
 
-        self.data[game_key].append({
+        record = {
             "steps": actions,
             "outcome": outcome
-        })
+        }
+        if board is not None:
+            record["width"] = board.width
+            record["height"] = board.height
+            record["layout"] = ''.join(str(v) for v in board.to_layout())
+        self.data[game_key].append(record)
+
+    def merge(self, other_data):
+        """
+        Append the records of another manager's data (e.g. a worker's) to ours.
+        """
+        for game_key, records in other_data.items():
+            self.data.setdefault(game_key, []).extend(records)
 
     def best_action_for_state(self, game_key, state_hash):
         """
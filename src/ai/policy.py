@@ -0,0 +1,269 @@
+# src/ai/policy.py
+import json
+import math
+import re
+
+from src.game.board import Board
+
+# Local features: the 5x5 window around a candidate reveal (centre excluded),
+# one code per cell, plus a bucket of the solver's mine probability.
+WINDOW = 5
+RADIUS = WINDOW // 2
+OFFSETS = [(dx, dy) for dy in range(-RADIUS, RADIUS + 1) for dx in range(-RADIUS, RADIUS + 1)
+           if not (dx == 0 and dy == 0)]
+# Codes 0-8 are clues of revealed cells
+HIDDEN = 9
+FLAGGED = 10
+OFF_BOARD = 11
+REVEALED_NO_CLUE = 12  # revealed, but the record has no layout to tell the clue
+NUM_CODES = 13
+PROB_BINS = 10
+PROB_UNKNOWN = PROB_BINS  # extra bucket when no probability is available
+NUM_FEATURES = len(OFFSETS) * NUM_CODES + PROB_BINS + 1
+
+
+def _prob_bucket(probability):
+    if probability is None:
+        return PROB_UNKNOWN
+    return min(int(probability * PROB_BINS), PROB_BINS - 1)
+
+
+def _feature_indices(code_at, x, y, probability=None):
+    """Active (one-hot) feature indices for a reveal at (x, y); code_at(nx, ny) -> code."""
+    indices = [k * NUM_CODES + code_at(x + dx, y + dy) for k, (dx, dy) in enumerate(OFFSETS)]
+    indices.append(len(OFFSETS) * NUM_CODES + _prob_bucket(probability))
+    return indices
+
+
+def board_features(board, x, y, probability=None, clues=True):
+    """
+    clues: False for a policy trained without layouts, whose revealed cells
+    were all encoded as REVEALED_NO_CLUE; play has to encode them the same way.
+    """
+    def code_at(nx, ny):
+        if not (0 <= nx < board.width and 0 <= ny < board.height):
+            return OFF_BOARD
+        c = board.grid[ny][nx]
+        if c.flagged:
+            return FLAGGED
+        if not c.revealed or c.has_mine:
+            return HIDDEN
+        return c.neighbor_mines if clues else REVEALED_NO_CLUE
+    return _feature_indices(code_at, x, y, probability)
+
+
+class LinearPolicy:
+    """
+    Compact linear (logistic) model over local features, trained offline by
+    train_policy(). Scoring a candidate is a sum of 25 looked-up weights in
+    plain Python, so the game loop needs neither NumPy nor the experience store.
+    clues: whether training saw the clues of revealed cells (see board_features).
+    """
+    def __init__(self, weights, bias=0.0, target="outcome", samples=0, clues=True):
+        self.weights = list(weights)
+        self.bias = bias
+        self.target = target
+        self.samples = samples
+        self.clues = clues
+
+    def score(self, board, x, y, probability=None):
+        """Logit of the target (winning the game / the reveal being safe); higher is better."""
+        w = self.weights
+        return self.bias + sum(w[i] for i in board_features(board, x, y, probability, self.clues))
+
+    def predict(self, board, x, y, probability=None):
+        return 1.0 / (1.0 + math.exp(-self.score(board, x, y, probability)))
+
+    def best_action(self, board, probabilities=None):
+        probabilities = probabilities or {}
+        best, best_score = None, None
+        for c in board.get_unrevealed_cells():
+            s = self.score(board, c.x, c.y, probabilities.get((c.x, c.y)))
+            if best_score is None or s > best_score:
+                best, best_score = ("reveal", c.x, c.y), s
+        return best
+
+    def save(self, filename):
+        with open(filename, 'w') as f:
+            json.dump({
+                "window": WINDOW,
+                "num_codes": NUM_CODES,
+                "prob_bins": PROB_BINS,
+                "target": self.target,
+                "samples": self.samples,
+                "clues": self.clues,
+                "bias": self.bias,
+                "weights": self.weights,
+            }, f)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'r') as f:
+            d = json.load(f)
+        if d["window"] != WINDOW or d["num_codes"] != NUM_CODES or d["prob_bins"] != PROB_BINS:
+            raise ValueError(f"{filename} was trained with a different feature layout")
+        return cls(d["weights"], d["bias"], d["target"], d["samples"], d.get("clues", True))
+
+
+def iter_records(filename, game_key=None):
+    """
+    Yield (game_key, record) from an experience store. A '.jsonl' file, as
+    written by LearningManager.export_jsonl(), is streamed line by line; a
+    LearningManager JSON file has to be loaded whole.
+    """
+    with open(filename, 'r') as f:
+        if filename.endswith('.jsonl'):
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                key = record.get("game_key")
+                if game_key is None or key == game_key:
+                    yield key, record
+            return
+        data = json.load(f)
+    for key, records in data.items():
+        if game_key is None or key == game_key:
+            for record in records:
+                yield key, record
+
+
+def _board_size(game_key, record):
+    if "width" in record:
+        return record["width"], record["height"]
+    # Older records only carry the size in the game key, e.g. '5x5_5mines'
+    m = re.match(r'(\d+)x(\d+)', game_key or '')
+    if m:
+        return int(m.group(1)), int(m.group(2))
+    return None
+
+
+def record_samples(game_key, record, target="outcome", solver=None):
+    """
+    Yield (feature_indices, label) for every reveal in a recorded game.
+    target 'outcome': label is 1 if the game was won.
+    target 'safe': label is 1 if the revealed cell had no mine (needs a layout).
+    solver: optional BayesianAnalyzer; for records with a layout the board of
+    each step is rebuilt and its mine probability fills the probability bucket.
+    Slow, but it runs offline only.
+    """
+    size = _board_size(game_key, record)
+    layout = record.get("layout")
+    if size is None or (target == "safe" and layout is None):
+        return
+    width, height = size
+    won = 1.0 if record["outcome"] == "win" else 0.0
+    for state, action in record["steps"]:
+        act_type, x, y = action
+        if act_type != "reveal":
+            continue
+        flagged = {tuple(p) for p in state[0]}
+        revealed = {tuple(p) for p in state[1]}
+
+        def code_at(nx, ny):
+            if not (0 <= nx < width and 0 <= ny < height):
+                return OFF_BOARD
+            if (nx, ny) in flagged:
+                return FLAGGED
+            if (nx, ny) not in revealed:
+                return HIDDEN
+            if layout is None:
+                return REVEALED_NO_CLUE
+            v = int(layout[ny * width + nx])
+            return v if v < 9 else HIDDEN
+
+        probability = None
+        if solver is not None and layout is not None:
+            board = _rebuild_board(width, height, layout, flagged, revealed)
+            probability = solver.compute_probabilities(board).get((x, y))
+
+        if target == "safe":
+            label = 0.0 if layout[y * width + x] == '9' else 1.0
+        else:
+            label = won
+        yield _feature_indices(code_at, x, y, probability), label
+
+
+def _rebuild_board(width, height, layout, flagged, revealed):
+    board = Board(width, height, layout.count('9'), layout=[int(v) for v in layout])
+    for row in board.grid:
+        for c in row:
+            c.flagged = (c.x, c.y) in flagged
+            c.revealed = (c.x, c.y) in revealed
+    return board
+
+
+def _sample_arrays(records, target, solver, chunk_size):
+    """
+    Feature index matrix X (samples x 25, int32), label vector y and whether
+    every sample came from a record with a layout (so clues were known).
+    X and y are filled chunk_size rows at a time into preallocated NumPy blocks
+    so no per-sample Python objects are kept while the records are streamed.
+    """
+    import numpy as np
+
+    width = len(OFFSETS) + 1
+    X_chunks, y_chunks = [], []
+    X = np.empty((chunk_size, width), dtype=np.int32)
+    y = np.empty(chunk_size, dtype=np.float64)
+    filled = 0
+    clues = True
+    for game_key, record in records:
+        for indices, label in record_samples(game_key, record, target, solver):
+            if record.get("layout") is None:
+                clues = False
+            X[filled] = indices
+            y[filled] = label
+            filled += 1
+            if filled == chunk_size:
+                X_chunks.append(X)
+                y_chunks.append(y)
+                X = np.empty((chunk_size, width), dtype=np.int32)
+                y = np.empty(chunk_size, dtype=np.float64)
+                filled = 0
+    X_chunks.append(X[:filled])
+    y_chunks.append(y[:filled])
+    if len(X_chunks) == 1:
+        return X_chunks[0], y_chunks[0], clues
+    return np.concatenate(X_chunks), np.concatenate(y_chunks), clues
+
+
+def train_policy(records, target="outcome", epochs=20, learning_rate=0.5, l2=1e-4, batch_size=4096, seed=0, solver=None,
+                 chunk_size=65536):
+    """
+    Fit a LinearPolicy (logistic regression on one-hot local features) with
+    NumPy mini-batch gradient descent.
+    records: iterable of (game_key, record), e.g. iter_records(filename).
+    chunk_size: samples per preallocated block while collecting features.
+    If any record lacks a layout, clue codes of the others are folded into
+    REVEALED_NO_CLUE too and the policy is saved with clues=False, so training
+    and play encode revealed cells the same way.
+    """
+    import numpy as np
+
+    X, y, clues = _sample_arrays(records, target, solver, chunk_size)
+    n = len(y)
+    if n == 0:
+        raise ValueError(f"No usable samples for target '{target}'")
+    if not clues:
+        window = X[:, :len(OFFSETS)]
+        codes = window % NUM_CODES
+        window += np.where(codes < 9, REVEALED_NO_CLUE - codes, 0).astype(np.int32)
+
+    rng = np.random.default_rng(seed)
+    w = np.zeros(NUM_FEATURES)
+    # Start from the base rate so early updates only learn the local signal
+    base = min(max(y.mean(), 1e-6), 1 - 1e-6)
+    b = math.log(base / (1 - base))
+    for _ in range(epochs):
+        order = rng.permutation(n)
+        for start in range(0, n, batch_size):
+            idx = order[start:start + batch_size]
+            Xb, yb = X[idx], y[idx]
+            logits = w[Xb].sum(axis=1) + b
+            err = 1.0 / (1.0 + np.exp(-logits)) - yb
+            grad = np.zeros(NUM_FEATURES)
+            np.add.at(grad, Xb, err[:, None])
+            w -= learning_rate * (grad / len(idx) + l2 * w)
+            b -= learning_rate * err.mean()
+    return LinearPolicy(w.tolist(), float(b), target, n, clues)
@@ -0,0 +1,192 @@
+# src/cli.py
+"""
+gamesweeper command line: run | bench | replay | train
+
+Only argparse and json are imported at startup; every subcommand imports
+what it needs when it runs, so short-lived worker and CI processes start fast.
+"""
+import argparse
+import json
+import sys
+
+
+def _load_config(filename):
+    if not filename:
+        return {}
+    with open(filename, 'r') as f:
+        return json.load(f)
+
+
+def cmd_run(args):
+    from src.experiment import run_experiment, print_result
+
+    config = _load_config(args.config)
+    for key in ("width", "height", "mines", "max_steps", "log", "summary", "corpus", "policy",
+                "experience_index", "safe_start", "no_guess"):
+        value = getattr(args, key)
+        if value is not None:
+            config[key] = value
+    print_result(run_experiment(config))
+
+
+def cmd_bench(args):
+    import contextlib
+    import io
+    import time
+
+    from src.game.board import Board
+
+    config = {"width": 5, "height": 5, "mines": 5, "games": 200, **_load_config(args.config)}
+    for key in ("width", "height", "mines", "games", "corpus"):
+        value = getattr(args, key)
+        if value is not None:
+            config[key] = value
+    width, height, mines, games = config["width"], config["height"], config["mines"], config["games"]
+    results = {"config": config}
+
+    start = time.perf_counter()
+    for _ in range(games):
+        Board(width, height, mines)
+    results["board_setup_us"] = (time.perf_counter() - start) / games * 1e6
+
+    if config.get("corpus"):
+        from src.game.corpus import BoardCorpus
+        with BoardCorpus(config["corpus"]) as corpus:
+            start = time.perf_counter()
+            for i in range(games):
+                corpus.load_board(i % len(corpus))
+            results["corpus_load_us"] = (time.perf_counter() - start) / games * 1e6
+
+    from src.experiment import run_ai_game_with_visualization, run_classic_game_with_visualization
+    # The game loops print every step; keep that out of the timing output
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        classic_wins = sum(run_classic_game_with_visualization(width, height, mines, width * height)
+                           for _ in range(games))
+        results["classic_game_ms"] = (time.perf_counter() - start) / games * 1000
+        start = time.perf_counter()
+        # No per-step CSV: file writes would be timed too and leave files behind
+        ai_wins = sum(run_ai_game_with_visualization(width, height, mines, width * height, game_id="bench",
+                                                     csv_log=False)
+                      for _ in range(games))
+        results["ai_game_ms"] = (time.perf_counter() - start) / games * 1000
+    results["classic_win_rate"] = classic_wins / games
+    results["ai_win_rate"] = ai_wins / games
+    print(json.dumps(results, indent=2))
+
+
+def cmd_replay(args):
+    from src.ai.policy import iter_records
+    from src.game.board import Board, MINE
+    from src.game.game_manager import GameManager
+
+    for i, (game_key, record) in enumerate(iter_records(args.experience, args.game_key)):
+        if i != args.index:
+            continue
+        print(f"Game {i} ({game_key}): {record['outcome']}, {len(record['steps'])} steps")
+        gm = None
+        if "layout" in record:
+            layout = [int(v) for v in record["layout"]]
+            board = Board(record["width"], record["height"], layout.count(MINE), layout=layout)
+            gm = GameManager(board)
+        for step, (state, action) in enumerate(record["steps"]):
+            act_type, x, y = action
+            print(f"\nStep {step}: {act_type} ({x}, {y})")
+            if gm:
+                # Restore the recorded state first: runners make moves (e.g. the
+                # opening reveal) that are not part of the recorded steps
+                flagged = {tuple(p) for p in state[0]}
+                revealed = {tuple(p) for p in state[1]}
+                for row in gm.board.grid:
+                    for c in row:
+                        c.flagged = (c.x, c.y) in flagged
+                        c.revealed = (c.x, c.y) in revealed
+                gm.make_move(x, y, act_type)
+                print(str(gm.board))
+        if gm is None:
+            print("\n(record has no layout, so only the actions can be replayed)")
+        return
+    print(f"No game {args.index} in {args.experience}", file=sys.stderr)
+    sys.exit(1)
+
+
+def cmd_train(args):
+    from src.ai.policy import iter_records, train_policy
+
+    config = {"target": "outcome", "epochs": 20, "learning_rate": 0.5, **_load_config(args.config)}
+    for key in ("target", "epochs", "learning_rate"):
+        value = getattr(args, key)
+        if value is not None:
+            config[key] = value
+    solver = None
+    if args.with_probabilities:
+        from src.ai.bayesian import BayesianAnalyzer
+        solver = BayesianAnalyzer()
+    policy = train_policy(iter_records(args.experience, args.game_key), target=config["target"],
+                          epochs=config["epochs"], learning_rate=config["learning_rate"], solver=solver)
+    policy.save(args.out)
+    print(f"Trained on {policy.samples} samples (target '{policy.target}'), saved to {args.out}")
+
+    if args.index:
+        from src.ai.experience_index import build_index
+        # Same reader as training, so a .jsonl store (or a broken file) is not silently empty
+        build_index(iter_records(args.experience, args.game_key), args.index)
+        print(f"Experience index written to {args.index}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="gamesweeper", description="GameSweeper AI simulations")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="sequential AI vs. classic experiment")
+    run.add_argument("config", nargs="?", help="JSON run config (keys of src.experiment.DEFAULT_CONFIG)")
+    run.add_argument("--width", type=int)
+    run.add_argument("--height", type=int)
+    run.add_argument("--mines", type=int)
+    run.add_argument("--max-steps", dest="max_steps", type=int)
+    run.add_argument("--log")
+    run.add_argument("--summary")
+    run.add_argument("--corpus")
+    run.add_argument("--policy")
+    run.add_argument("--experience-index", dest="experience_index", help="index written by train --index")
+    # A corpus needs --no-safe-start: its boards are fixed before the first click
+    run.add_argument("--safe-start", dest="safe_start", action=argparse.BooleanOptionalAction)
+    run.add_argument("--no-guess", dest="no_guess", action=argparse.BooleanOptionalAction)
+    run.set_defaults(func=cmd_run)
+
+    bench = sub.add_parser("bench", help="time board setup and game loops")
+    bench.add_argument("config", nargs="?", help="JSON bench config")
+    bench.add_argument("--width", type=int)
+    bench.add_argument("--height", type=int)
+    bench.add_argument("--mines", type=int)
+    bench.add_argument("--games", type=int)
+    bench.add_argument("--corpus")
+    bench.set_defaults(func=cmd_bench)
+
+    replay = sub.add_parser("replay", help="replay a recorded game step by step")
+    replay.add_argument("experience", help="experience store (.json or .jsonl)")
+    replay.add_argument("--game-key", dest="game_key")
+    replay.add_argument("--index", type=int, default=0, help="which recorded game to replay")
+    replay.set_defaults(func=cmd_replay)
+
+    train = sub.add_parser("train", help="train a policy from the experience store")
+    train.add_argument("experience", help="experience store (.json or .jsonl)")
+    train.add_argument("--config", help="JSON training config")
+    train.add_argument("--out", default="policy.json")
+    train.add_argument("--game-key", dest="game_key")
+    train.add_argument("--target", choices=("outcome", "safe"))
+    train.add_argument("--epochs", type=int)
+    train.add_argument("--learning-rate", dest="learning_rate", type=float)
+    train.add_argument("--with-probabilities", action="store_true", help="recompute solver probabilities (slow)")
+    train.add_argument("--index", help="also build a shared experience index at this path")
+    train.set_defaults(func=cmd_train)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+# src/experiment.py
+"""
+AI vs. classic experiments: the game loops, DEFAULT_CONFIG and
+run_experiment(). run_simulation_2.py and `gamesweeper run` are thin
+front ends over this module.
+"""
+import contextlib
+import os
+import random
+import warnings
+
+from src.game.board import Board
+from src.game.chunked_board import ChunkedBoard
+from src.game.game_manager import GameManager
+from src.ai.bayesian import BayesianAnalyzer
+from src.ai.mdp import MDP
+from src.ai.pattern_solver import PatternSolver
+from src.ai.frontier_solver import FrontierSolver
+from src.ai.learning_manager import LearningManager
+from src.metrics.dynamic_gr import DynamicGR
+from src.utils.logger import CSVLogger
+from src.metrics.aggregator import StreamingAggregator
+from src.metrics.sequential import SequentialComparison, run_sequential_experiment
+
+# Defaults for run_experiment(); a run config file only needs the keys it changes
+DEFAULT_CONFIG = {
+    "width": 9,
+    "height": 9,
+    "mines": 20,
+    "max_steps": 200,
+    "experience": "experience_data.json",
+    # Optional index built by `gamesweeper train --index`; used instead of parsing
+    # the whole experience file (which is then ignored)
+    "experience_index": None,
+    "game_key": "5x5_5mines",
+    "log": "simulation_log.txt",  # per-step output of every game goes here; null discards it
+    "summary": "gr_summary.json",
+    # Optional BoardCorpus file: AI and classic then play identical boards. Corpus
+    # boards are fixed up front, so safe_start and no_guess must be false with it
+    # (run_experiment raises ValueError otherwise) and an opening reveal can hit a mine.
+    "corpus": None,
+    "policy": None,  # optional LinearPolicy artifact used instead of the MDP
+    "safe_start": True,  # generated boards only: the opening reveal never hits a mine
+    "no_guess": False,  # generated boards only: the pattern solver clears them without guessing
+    "layout_cache": None,  # reuse accepted layouts once this many were generated (games become dependent)
+    # Exact mine probabilities cost ~2^n for an n-cell frontier; safe_start openings
+    # often leave 20+ cells, so bigger frontiers use a local estimate (null: always exact)
+    "max_frontier": 16,
+    "csv": False,  # one gr_metrics_game_<id>.csv per AI game; the summary covers all games
+    "sequential": {"alpha": 0.05, "beta": 0.05, "p1": 0.6, "precision": 0.05, "max_games": 1000},
+}
+
+def board_state_hash(board):
+    """
+    Simple state hash: frozensets of flagged and revealed.
+    """
+    flagged_positions = []
+    revealed_positions = []
+    for y in range(board.height):
+        for x in range(board.width):
+            c = board.grid[y][x]
+            if c.flagged:
+                flagged_positions.append((x, y))
+            if c.revealed:
+                revealed_positions.append((x, y))
+    return (frozenset(flagged_positions), frozenset(revealed_positions))
+
+
+def print_board_and_probabilities(board, probabilities):
+    """Prints the board and its corresponding probability matrix."""
+    print("\nGame Board:")
+    print(str(board))
+
+    print("\nProbability Matrix:")
+    for y in range(board.height):
+        row_probs = []
+        for x in range(board.width):
+            cell = board.grid[y][x]
+            if cell.revealed:
+                row_probs.append("Revealed")
+            elif cell.flagged:
+                row_probs.append("Flagged")
+            else:
+                prob = probabilities.get((x, y), None)
+                if prob is not None:
+                    row_probs.append(f"{prob:.2f}")
+                else:
+                    row_probs.append("N/A")
+        print(" ".join(row_probs))
+
+
+def run_ai_game_with_visualization(width=5, height=5, mines=5, max_steps=50, learning_mgr=None, game_key="5x5_5mines", game_id=1, aggregator=None, layout=None, policy=None, board_options=None, csv_log=False, max_frontier=None):
+    """
+    AI approach with visualization of each step, including DynamicGR updates.
+    csv_log: also write every step to gr_metrics_game_{game_id}.csv. Off by
+    default; long runs should rely on the aggregator instead of one file per game.
+    policy: optional LinearPolicy (src.ai.policy) used instead of the MDP when
+    there is no forced move.
+    board_options: extra Board arguments, e.g. {"safe_start": True, "no_guess": True}.
+    layout: optional pre-generated board (e.g. BoardCorpus.layout(i)) so several
+    runs can be compared on identical boards.
+    max_frontier: passed to BayesianAnalyzer; bigger frontiers get a local
+    estimate instead of the exponential enumeration.
+    If an aggregator (StreamingAggregator) is given, every GR data point and the
+    outcome are also fed to it.
+    """
+    board = Board(width, height, mines, layout=layout, **(board_options or {}))
+    gm = GameManager(board)
+    bayes = BayesianAnalyzer(max_frontier)
+    pattern_solver = PatternSolver()
+    dynamic_gr = DynamicGR()  # Initialize DynamicGR
+
+    logger = None
+    if csv_log:
+        # Create a unique filename for the current game
+        csv_filename = f"gr_metrics_game_{game_id}.csv"
+        logger = CSVLogger(csv_filename)  # Initialize CSV Logger for this game
+
+    gm.make_move(width // 2, height // 2, "reveal")  # optional first reveal in center
+
+    step = 0
+    while not gm.is_over() and step < max_steps:
+        # Build a state hash for learning
+        st_hash = board_state_hash(board)
+
+        # Compute probabilities
+        probabilities = bayes.compute_probabilities(board)
+
+        # Update DynamicGR and get metrics
+        gr_value, gr_data = dynamic_gr.update(board, step, probabilities)
+        print(f"\nStep {step}:")
+        print(f"DynamicGR Value: {gr_value:.4f}")  # Display DynamicGR value
+        print(f"DynamicGR Metrics: {gr_data}")  # Display other metrics
+
+        # Log DynamicGR metrics to CSV
+        if logger:
+            logger.log(step, {**gr_data, 'game_id': game_id})
+        if aggregator:
+            aggregator.update_step(gr_data)
+
+        # Print the board and probabilities
+        print_board_and_probabilities(board, probabilities)
+
+        # Select action using existing logic
+        best_act_from_history = None
+        if learning_mgr:
+            best_act_from_history = learning_mgr.best_action_for_state(game_key, st_hash)
+
+        if best_act_from_history:
+            act_type, x, y = best_act_from_history
+            gm.make_move(x, y, act_type)
+        else:
+            forced_moves = pattern_solver.find_forced_moves(board)
+            if forced_moves:
+                fm = forced_moves[0]
+                gm.make_move(fm[1], fm[2], fm[0])
+            else:
+                if policy:
+                    action = policy.best_action(board, probabilities)
+                else:
+                    mdp = MDP(board, probabilities, depth=3)  # Initialize MDP
+                    action = mdp.find_best_action()  # Use MDP to find the best action
+                if action:
+                    act_type, x, y = action
+                    gm.make_move(x, y, act_type)
+                else:
+                    action = guess_safest_cell(board, bayes)
+                    if not action:
+                        break
+                    act_type, x, y = action
+                    gm.make_move(x, y, act_type)
+
+        step += 1
+
+    outcome = "win" if gm.is_victory() else "lose"
+    print(f"\nGame Over: {outcome}")
+    if aggregator:
+        aggregator.record_game("ai", gm.is_victory(), step)
+    return gm.is_victory()
+
+
+def run_classic_game_with_visualization(width=5, height=5, mines=5, max_steps=50, aggregator=None, layout=None, board_options=None):
+    """
+    Classic approach with visualization of each step.
+    """
+    board = Board(width, height, mines, layout=layout, **(board_options or {}))
+    gm = GameManager(board)
+
+    step = 0
+    while not gm.is_over() and step < max_steps:
+        unrevealed = board.get_unrevealed_cells()
+        if not unrevealed:
+            break
+
+        # Randomly select an unrevealed cell to reveal
+        cell = random.choice(unrevealed)
+        gm.make_move(cell.x, cell.y, "reveal")
+
+        # Print the board after the move
+        print(f"\nStep {step}:")
+        print("\nGame Board:")
+        print(str(board))
+
+        step += 1
+
+    outcome = "win" if gm.is_victory() else "lose"
+    print(f"\nGame Over: {outcome}")
+    if aggregator:
+        aggregator.record_game("classic", gm.is_victory(), step)
+    return gm.is_victory()
+
+
+def run_chunked_game(width=None, height=None, density=0.15, seed=0, max_steps=1000, aggregator=None):
+    """
+    AI game on a sparse ChunkedBoard (huge or unbounded). Uses FrontierSolver and
+    DynamicGR.update_explored, which only touch the explored area, so the cost
+    per step follows the frontier rather than width x height. Nothing is printed
+    per step. Unbounded boards never end in victory; they run until a mine or
+    max_steps.
+    """
+    board = ChunkedBoard(width, height, density, seed)
+    gm = GameManager(board)
+    solver = FrontierSolver()
+    dynamic_gr = DynamicGR()
+
+    gm.make_move(*_chunked_start_cell(board), "reveal")
+
+    step = 0
+    while not gm.is_over() and step < max_steps:
+        forced_moves = solver.find_forced_moves(board)
+        probabilities = {} if forced_moves else solver.compute_probabilities(board)
+        gr_value, gr_data = dynamic_gr.update_explored(board, step, probabilities)
+        if aggregator:
+            aggregator.update_step(gr_data)
+
+        if forced_moves:
+            # Apply them all: each comes from a clue that is still valid
+            for act_type, fx, fy in forced_moves:
+                if act_type == "reveal" or not board.grid[fy][fx].flagged:
+                    gm.make_move(fx, fy, act_type)
+        else:
+            action = solver.guess(board, probabilities)
+            if not action:
+                break
+            act_type, gx, gy = action
+            gm.make_move(gx, gy, act_type)
+        step += 1
+
+    cells, mines, revealed_safe, hidden = board.explored_stats()
+    print(f"Chunked game over after {step} steps: {revealed_safe} safe cells revealed, "
+          f"{board.touched_chunks()} chunks touched, {'win' if gm.is_victory() else 'stopped'}")
+    if aggregator:
+        aggregator.record_game("chunked", gm.is_victory(), step)
+    return gm.is_victory()
+
+
+def _chunked_start_cell(board, search=64):
+    """
+    Safe start for run_chunked_game: the first zero-clue cell in the top-left
+    search x search window (row by row), else the mine-free cell there with the
+    lowest clue. Only mine sets are consulted, so no chunk is materialized.
+    """
+    best = None
+    for y in range(min(board.height or search, search)):
+        for x in range(min(board.width or search, search)):
+            if board.has_mine(x, y):
+                continue
+            clue = board.count_neighbor_mines(x, y)
+            if clue == 0:
+                return x, y
+            if best is None or clue < best[0]:
+                best = (clue, x, y)
+    if best is None:
+        raise ValueError("No mine-free cell to start from")
+    return best[1], best[2]
+
+
+def guess_safest_cell(board, bayes):
+    unrevealed = board.get_unrevealed_cells()
+    if not unrevealed:
+        return None
+    probs = bayes.compute_probabilities(board)
+    best_cell = None
+    best_prob = 1.0
+    for c in unrevealed:
+        p = probs.get((c.x, c.y), 0.5)
+        if p < best_prob:
+            best_prob = p
+            best_cell = (c.x, c.y)
+    return ("reveal", best_cell[0], best_cell[1])
+
+
+def run_experiment(config=None):
+    """
+    Play classic/AI game pairs until the SPRT decides the comparison or the
+    win-rate difference is known to the configured precision.
+    config: dict overriding DEFAULT_CONFIG. Returns SequentialComparison.summary().
+    """
+    config = {**DEFAULT_CONFIG, **(config or {})}
+    config["sequential"] = {**DEFAULT_CONFIG["sequential"], **config.get("sequential", {})}
+    width, height, mines, max_steps = config["width"], config["height"], config["mines"], config["max_steps"]
+
+    game_key = config["game_key"]
+    comparison = SequentialComparison(**config["sequential"])
+
+    board_options = {"safe_start": config["safe_start"], "no_guess": config["no_guess"]}
+    if config["layout_cache"]:
+        from src.game.generator import LayoutCache
+        board_options["layout_cache"] = LayoutCache(max_per_key=config["layout_cache"])
+        games = 2 * config["sequential"]["max_games"]  # one AI and one classic board per pair
+        if config["layout_cache"] < games:
+            warnings.warn(f"Layout cache keeps {config['layout_cache']} layouts but up to {games} games may be "
+                          f"played; later games reuse cached boards, so pairs are no longer independent as "
+                          f"the sequential test assumes")
+
+    policy = None
+    if config["policy"]:
+        from src.ai.policy import LinearPolicy
+        policy = LinearPolicy.load(config["policy"])
+    if config["corpus"] and (config["safe_start"] or config["no_guess"]):
+        raise ValueError("A corpus fixes the mine layouts up front; set safe_start and no_guess "
+                         "to false to play it")
+
+    learning_mgr = None
+    if config["experience_index"]:
+        # Memory-mapped and nothing parsed up front; the runners only query it
+        from src.ai.experience_index import ExperienceIndex
+        learning_mgr = ExperienceIndex(config["experience_index"])
+    elif config["experience"]:
+        learning_mgr = LearningManager(config["experience"])
+    corpus = None
+    try:
+        if config["corpus"]:
+            from src.game.corpus import BoardCorpus
+            corpus = BoardCorpus(config["corpus"])
+            width, height, mines = corpus.width, corpus.height, corpus.mines
+            if len(corpus) < config["sequential"]["max_games"]:
+                warnings.warn(f"Corpus has {len(corpus)} boards but up to {config['sequential']['max_games']} "
+                              f"game pairs may be played; boards will be reused, so pairs are no longer "
+                              f"independent as the sequential test assumes")
+
+        # Entropy reaches one bit per hidden cell; size its histogram to the board
+        aggregator = StreamingAggregator(max_steps=max_steps, ranges={"entropy": (0.0, float(width * height))})
+
+        def layout_for(i):
+            return corpus.layout(i % len(corpus)) if corpus else None
+
+        def play_classic(i):
+            print(f"\n--- Classic Game {i + 1} ---")
+            return run_classic_game_with_visualization(width, height, mines, max_steps, aggregator,
+                                                       layout=layout_for(i), board_options=board_options)
+
+        def play_ai(i):
+            print(f"\n--- AI Game {i + 1} ---")
+            return run_ai_game_with_visualization(width, height, mines, max_steps, learning_mgr, game_key,
+                                                  game_id=i + 1, aggregator=aggregator, layout=layout_for(i),
+                                                  policy=policy, board_options=board_options, csv_log=config["csv"],
+                                                  max_frontier=config["max_frontier"])
+
+        # Per-step output of every game goes to the log file, not the console
+        with open(config["log"] or os.devnull, "w") as log, contextlib.redirect_stdout(log):
+            run_sequential_experiment(play_ai, play_classic, comparison)
+    finally:
+        if corpus:
+            corpus.close()
+        if config["experience_index"] and learning_mgr:
+            learning_mgr.close()
+
+    # Compact summary of every game played; load it with src.metrics.aggregator.load_summary
+    if config["summary"]:
+        aggregator.save_summary(config["summary"])
+    return comparison.summary()
+
+
+def print_result(result):
+    low, high = result['difference_ci']
+    print(f"\nStopped after {result['pairs']} game pairs: {result['decision']}")
+    print(f"Classic Wins: {result['classic']['wins']}/{result['classic']['games']} ({result['classic']['rate']:.2%})")
+    print(f"AI Wins: {result['ai']['wins']}/{result['ai']['games']} ({result['ai']['rate']:.2%})")
+    print(f"AI - Classic win rate: {result['difference']:.2%} (95% CI {low:.2%} to {high:.2%})")
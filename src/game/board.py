@@ -2,14 +2,39 @@
 import random
 from .cell import Cell
 
+# Layout encoding shared with the board corpus: 0-8 = clue, MINE = mine
+MINE = 9
+
 class Board:
-    def __init__(self, width=5, height=5, mines=5):
+    def __init__(self, width=5, height=5, mines=5, layout=None, safe_start=False, no_guess=False, layout_cache=None):
+        """
+        layout: optional pre-generated layout (bytes-like of width*height values,
+        row-major, 0-8 = clue, MINE = mine), e.g. one board of a memory-mapped
+        BoardCorpus. When given, no mines are placed and no clues are counted.
+        safe_start: place the mines on the first reveal instead, keeping that
+        cell's neighbourhood clear (see src.game.generator.generate_layout).
+        no_guess: like safe_start, but only accept layouts the pattern solver
+        can clear from the first click without guessing.
+        layout_cache: optional LayoutCache to draw those layouts from.
+        safe_start/no_guess cannot be combined with layout: a given layout
+        already fixes the mines, so they raise ValueError.
+        """
+        if layout is not None and (safe_start or no_guess):
+            raise ValueError("safe_start/no_guess cannot be used with a pre-generated layout")
         self.width = width
         self.height = height
         self.mines = mines
         self.grid = []
         self.game_over = False
-        self._initialize_board()
+        self.no_guess = no_guess
+        self.layout_cache = layout_cache
+        self.mines_pending = layout is None and (safe_start or no_guess)
+        if layout is not None:
+            self._initialize_from_layout(layout)
+        elif self.mines_pending:
+            self.grid = [[Cell(x, y) for x in range(width)] for y in range(height)]
+        else:
+            self._initialize_board()
 
     def _initialize_board(self):
         cells = [Cell(x, y) for y in range(self.height) for x in range(self.width)]
@@ -24,6 +49,46 @@ class Board:
                 if not c.has_mine:
                     c.neighbor_mines = self.count_neighbor_mines(c.x, c.y)
 
+    def _initialize_from_layout(self, layout):
+        if len(layout) != self.width * self.height:
+            raise ValueError(f"Layout has {len(layout)} cells, expected {self.width * self.height}")
+        cells = []
+        for i, value in enumerate(layout):
+            c = Cell(i % self.width, i // self.width, has_mine=value == MINE)
+            if not c.has_mine:
+                c.neighbor_mines = value
+            cells.append(c)
+        self.grid = [cells[i*self.width:(i+1)*self.width] for i in range(self.height)]
+
+    def _place_mines(self, first_click):
+        # Deferred placement for safe_start/no_guess boards, on the first reveal
+        from .generator import generate_layout
+        if self.layout_cache is not None:
+            layout = self.layout_cache.layout(self.width, self.height, self.mines, first_click, self.no_guess)
+        else:
+            layout = generate_layout(self.width, self.height, self.mines, first_click, self.no_guess)
+        self.apply_layout(layout)
+
+    def apply_layout(self, layout):
+        """
+        Place the mines of a board whose placement is still pending, e.g. with a
+        layout generated elsewhere (such as a worker process) for the first click.
+        Flags already set are kept.
+        """
+        if not self.mines_pending:
+            raise RuntimeError("Mines are already placed")
+        if len(layout) != self.width * self.height:
+            raise ValueError(f"Layout has {len(layout)} cells, expected {self.width * self.height}")
+        for i, value in enumerate(layout):
+            c = self.grid[i // self.width][i % self.width]
+            c.has_mine = value == MINE
+            c.neighbor_mines = 0 if c.has_mine else value
+        self.mines_pending = False
+
+    def to_layout(self):
+        """Encode the mine layout in the same format the layout argument accepts."""
+        return bytes(MINE if c.has_mine else c.neighbor_mines for row in self.grid for c in row)
+
     def count_neighbor_mines(self, x, y):
         return sum(1 for n in self.get_neighbors(x, y) if n.has_mine)
 
@@ -37,6 +102,8 @@ class Board:
         return neighbors
 
     def reveal_cell(self, x, y):
+        if self.mines_pending:
+            self._place_mines((x, y))
         cell = self.grid[y][x]
         if cell.flagged or cell.revealed:
             return
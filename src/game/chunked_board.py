@@ -0,0 +1,255 @@
+# src/game/chunked_board.py
+import random
+from .cell import Cell
+
+# Below ~0.095 the zero-clue openings of an infinite board percolate, so one
+# reveal could flood forever; unbounded boards must stay clear of that.
+MIN_UNBOUNDED_DENSITY = 0.12
+
+
+class ChunkedBoard:
+    """
+    Sparse, lazily generated board for very large or unbounded games.
+
+    The board is split into chunk_size x chunk_size chunks. Mine positions in a
+    chunk come from a RNG seeded with (seed, chunk x, chunk y), so any chunk
+    can be regenerated on demand and the layout never has to be stored.
+    Cell objects (with their clue counts) are only created for chunks that have
+    been touched, so memory grows with the explored area, not width x height.
+
+    width/height of None make that axis unbounded ("endless" boards); those need
+    density >= MIN_UNBOUNDED_DENSITY. A single reveal opens at most max_flood
+    cells; cells left over stay hidden next to revealed zeros, where a solver
+    finds them as forced reveals.
+
+    It exposes the same methods as Board, so GameManager works unchanged, and
+    grid[y][x] raises IndexError outside the board. Whole-grid code
+    (BayesianAnalyzer, PatternSolver, DynamicGR.update) works on small bounded
+    boards but materializes every chunk. On big boards use FrontierSolver and
+    DynamicGR.update_explored, which only look at boundary_cells() and
+    explored_stats().
+    """
+    def __init__(self, width=None, height=None, density=0.15, seed=0, chunk_size=16, max_flood=100000):
+        if (width is None or height is None) and density < MIN_UNBOUNDED_DENSITY:
+            raise ValueError(f"Unbounded boards need density >= {MIN_UNBOUNDED_DENSITY}, got {density}")
+        self.width = width
+        self.height = height
+        self.density = density
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.game_over = False
+        self.max_flood = max_flood
+        self.revealed_safe = 0
+        # Counters over the touched chunks only
+        self.explored_cells = 0
+        self.explored_mines = 0
+        self.flagged_count = 0
+        self._boundary = set()  # revealed safe cells that may still have hidden neighbours
+        self._chunks = {}       # (cx, cy) -> list of Cell (None outside the board)
+        self._chunk_mines = {}  # (cx, cy) -> set of local indices holding a mine
+        self.grid = _GridView(self)
+        self.mines = self._total_mines() if self.is_bounded() else None
+
+    def is_bounded(self):
+        return self.width is not None and self.height is not None
+
+    def in_bounds(self, x, y):
+        if self.width is not None and not 0 <= x < self.width:
+            return False
+        if self.height is not None and not 0 <= y < self.height:
+            return False
+        return True
+
+    def _chunk_cells_in_bounds(self, cx, cy):
+        cs = self.chunk_size
+        x0, y0 = cx * cs, cy * cs
+        return [ly * cs + lx for ly in range(cs) for lx in range(cs) if self.in_bounds(x0 + lx, y0 + ly)]
+
+    def _mines_in_chunk(self, cx, cy):
+        # Deterministic per chunk: the same (seed, cx, cy) always gives the same mines
+        key = (cx, cy)
+        mines = self._chunk_mines.get(key)
+        if mines is None:
+            positions = self._chunk_cells_in_bounds(cx, cy)
+            rng = random.Random(f"{self.seed}:{cx}:{cy}")
+            count = round(self.density * len(positions))
+            mines = set(rng.sample(positions, count))
+            self._chunk_mines[key] = mines
+        return mines
+
+    def _total_mines(self):
+        # Counted per chunk shape without generating any layout: full chunks,
+        # plus the partial chunks along the right and bottom edges
+        cs = self.chunk_size
+        widths = [(cs, self.width // cs)] + ([(self.width % cs, 1)] if self.width % cs else [])
+        heights = [(cs, self.height // cs)] + ([(self.height % cs, 1)] if self.height % cs else [])
+        return sum(nw * nh * round(self.density * w * h) for w, nw in widths for h, nh in heights)
+
+    def has_mine(self, x, y):
+        if not self.in_bounds(x, y):
+            return False
+        cs = self.chunk_size
+        cx, lx = divmod(x, cs)
+        cy, ly = divmod(y, cs)
+        return (ly * cs + lx) in self._mines_in_chunk(cx, cy)
+
+    def _materialize_chunk(self, cx, cy):
+        cs = self.chunk_size
+        mines = self._mines_in_chunk(cx, cy)
+        cells = [None] * (cs * cs)
+        for idx in self._chunk_cells_in_bounds(cx, cy):
+            x, y = cx * cs + idx % cs, cy * cs + idx // cs
+            c = Cell(x, y, has_mine=idx in mines)
+            if not c.has_mine:
+                c.neighbor_mines = self.count_neighbor_mines(x, y)
+            cells[idx] = c
+            self.explored_cells += 1
+            self.explored_mines += c.has_mine
+        self._chunks[(cx, cy)] = cells
+        return cells
+
+    def get_cell(self, x, y):
+        if not self.in_bounds(x, y):
+            raise IndexError(f"({x}, {y}) is outside the board")
+        cs = self.chunk_size
+        cx, lx = divmod(x, cs)
+        cy, ly = divmod(y, cs)
+        cells = self._chunks.get((cx, cy))
+        if cells is None:
+            cells = self._materialize_chunk(cx, cy)
+        return cells[ly * cs + lx]
+
+    def count_neighbor_mines(self, x, y):
+        # Uses the mine sets only, so it never materializes neighbouring chunks
+        return sum(1 for nx in (x-1, x, x+1) for ny in (y-1, y, y+1)
+                   if (nx != x or ny != y) and self.has_mine(nx, ny))
+
+    def get_neighbors(self, x, y):
+        neighbors = []
+        for nx in [x-1, x, x+1]:
+            for ny in [y-1, y, y+1]:
+                if self.in_bounds(nx, ny) and not (nx == x and ny == y):
+                    neighbors.append(self.get_cell(nx, ny))
+        return neighbors
+
+    def reveal_cell(self, x, y):
+        cell = self.get_cell(x, y)
+        if cell.flagged or cell.revealed:
+            return
+        # Iterative flood fill: openings on huge boards would overflow the recursion limit
+        stack = [cell]
+        opened = 0
+        while stack and opened < self.max_flood:
+            c = stack.pop()
+            if c.flagged or c.revealed:
+                continue
+            c.revealed = True
+            if c.has_mine:
+                self.game_over = True
+                return
+            self.revealed_safe += 1
+            opened += 1
+            self._boundary.add((c.x, c.y))
+            if c.neighbor_mines == 0:
+                for n in self.get_neighbors(c.x, c.y):
+                    if not n.revealed and not n.flagged:
+                        stack.append(n)
+
+    def flag_cell(self, x, y):
+        cell = self.get_cell(x, y)
+        if not cell.revealed:
+            cell.flagged = not cell.flagged
+            self.flagged_count += 1 if cell.flagged else -1
+
+    def is_victory(self):
+        # An unbounded board can never be cleared
+        if not self.is_bounded():
+            return False
+        return self.revealed_safe == self.width * self.height - self.mines
+
+    def touched_chunks(self):
+        return len(self._chunks)
+
+    def boundary_cells(self):
+        """
+        Revealed safe cells that still have hidden, unflagged neighbours: the
+        only cells a solver has to look at. Settled cells are pruned lazily.
+        """
+        cells = []
+        for (x, y) in list(self._boundary):
+            c = self.get_cell(x, y)
+            if any(not n.revealed and not n.flagged for n in self.get_neighbors(x, y)):
+                cells.append(c)
+            else:
+                self._boundary.discard((x, y))
+        return cells
+
+    def explored_stats(self):
+        """(cells, mines, revealed safe cells, hidden unflagged cells) over the touched chunks."""
+        hidden = self.explored_cells - self.revealed_safe - self.flagged_count - (1 if self.game_over else 0)
+        return self.explored_cells, self.explored_mines, self.revealed_safe, hidden
+
+    def get_unrevealed_cells(self):
+        # Only the explored area: untouched chunks are never materialized here
+        return [c for cells in self._chunks.values() for c in cells
+                if c is not None and not c.revealed and not c.flagged]
+
+    def __str__(self):
+        # Renders the bounding box of the touched chunks; '?' marks untouched cells
+        if not self._chunks:
+            return ""
+        cs = self.chunk_size
+        xs = [cx for cx, _ in self._chunks]
+        ys = [cy for _, cy in self._chunks]
+        rows = []
+        for y in range(min(ys) * cs, (max(ys) + 1) * cs):
+            row = []
+            for x in range(min(xs) * cs, (max(xs) + 1) * cs):
+                if not self.in_bounds(x, y):
+                    continue
+                cells = self._chunks.get((x // cs, y // cs))
+                row.append(str(cells[(y % cs) * cs + x % cs]) if cells else "?")
+            if row:
+                rows.append(' '.join(row))
+        return '\n'.join(rows)
+
+
+class _GridView:
+    """Lets board.grid[y][x] work on a ChunkedBoard without building the grid."""
+    def __init__(self, board):
+        self.board = board
+
+    def __getitem__(self, y):
+        if self.board.height is not None and not 0 <= y < self.board.height:
+            raise IndexError(f"row {y} is outside the board")
+        return _RowView(self.board, y)
+
+    def __len__(self):
+        if self.board.height is None:
+            raise TypeError("an unbounded board has no length")
+        return self.board.height
+
+    def __iter__(self):
+        # Iterating materializes every chunk; refuse outright when that never ends
+        for y in range(len(self)):
+            yield _RowView(self.board, y)
+
+
+class _RowView:
+    def __init__(self, board, y):
+        self.board = board
+        self.y = y
+
+    def __getitem__(self, x):
+        if self.board.width is not None and not 0 <= x < self.board.width:
+            raise IndexError(f"column {x} is outside the board")
+        return self.board.get_cell(x, self.y)
+
+    def __len__(self):
+        if self.board.width is None:
+            raise TypeError("an unbounded board has no length")
+        return self.board.width
+
+    def __iter__(self):
+        for x in range(len(self)):
+            yield self.board.get_cell(x, self.y)
@@ -0,0 +1,125 @@
+# src/game/corpus.py
+import mmap
+import struct
+
+from .board import Board, MINE
+
+# File layout: 16-byte header, then `count` boards of width*height bytes each
+# (row-major, 0-8 = clue, MINE = mine), so board i starts at
+# HEADER_SIZE + i * width * height and can be read straight out of an mmap.
+MAGIC = b'GSWC'
+VERSION = 1
+HEADER = struct.Struct('<4sHHHHI')  # magic, version, width, height, mines, count
+HEADER_SIZE = HEADER.size
+
+
+def _check_header(width, height, mines, count):
+    # Checked before the output file is opened, so a bad config never truncates it
+    for name, value, limit in (("width", width, 0xFFFF), ("height", height, 0xFFFF),
+                               ("mines", mines, 0xFFFF), ("count", count, 0xFFFFFFFF)):
+        if not 0 <= value <= limit:
+            raise ValueError(f"Corpus {name} must be between 0 and {limit}, got {value}")
+
+
+def generate_layouts(count, width, height, mines, rng):
+    """
+    Vectorized generation of `count` layouts as a (count, height, width) uint8 array.
+    rng: a numpy Generator.
+    """
+    import numpy as np  # only needed to generate, not to load a corpus
+
+    cells = width * height
+    # Random keys per cell; the `mines` smallest keys of each board become mines
+    keys = rng.random((count, cells))
+    mine_mask = np.zeros((count, cells), dtype=bool)
+    if mines > 0:
+        idx = np.argpartition(keys, mines - 1, axis=1)[:, :mines]
+        np.put_along_axis(mine_mask, idx, True, axis=1)
+    mine_mask = mine_mask.reshape(count, height, width)
+
+    # Clues: sum of the 8 shifted neighbour planes of a zero-padded mask
+    padded = np.pad(mine_mask, ((0, 0), (1, 1), (1, 1))).astype(np.uint8)
+    clues = np.zeros((count, height, width), dtype=np.uint8)
+    for dy in (0, 1, 2):
+        for dx in (0, 1, 2):
+            if dy == 1 and dx == 1:
+                continue
+            clues += padded[:, dy:dy + height, dx:dx + width]
+    return np.where(mine_mask, np.uint8(MINE), clues).astype(np.uint8)
+
+
+def write_corpus(filename, count, width, height, mines, seed=None, batch_size=10000):
+    """Generate `count` boards for one configuration and store them packed in `filename`."""
+    import numpy as np
+
+    if not 0 <= mines <= width * height:
+        raise ValueError(f"Cannot place {mines} mines on a {width}x{height} board")
+    _check_header(width, height, mines, count)
+    rng = np.random.default_rng(seed)
+    with open(filename, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, width, height, mines, count))
+        written = 0
+        while written < count:
+            n = min(batch_size, count - written)
+            f.write(generate_layouts(n, width, height, mines, rng).tobytes())
+            written += n
+
+
+def write_layouts(filename, width, height, mines, layouts):
+    """Store already generated layouts (bytes-like, e.g. from Board.to_layout()) as a corpus."""
+    layouts = list(layouts)
+    _check_header(width, height, mines, len(layouts))
+    for layout in layouts:
+        if len(layout) != width * height:
+            raise ValueError(f"Layout has {len(layout)} cells, expected {width * height}")
+    with open(filename, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, width, height, mines, len(layouts)))
+        for layout in layouts:
+            f.write(bytes(layout))
+
+
+class BoardCorpus:
+    """
+    Read-only, memory-mapped view of a corpus file.
+
+    Nothing is parsed or copied on open; layout(i) reads just that board's
+    width*height bytes from the mapping. Parallel workers should each open the
+    same file by name; the OS shares the mapped pages between them.
+    """
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.width, self.height, self.mines, self.count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{filename} is not a GameSweeper corpus (version {VERSION})")
+        self.board_size = self.width * self.height
+        expected = HEADER_SIZE + self.count * self.board_size
+        if len(self._mmap) < expected:
+            self.close()
+            raise ValueError(f"{filename} is truncated: {len(self._mmap)} bytes, expected {expected}")
+
+    def __len__(self):
+        return self.count
+
+    def layout(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError(f"Board {index} out of range (corpus has {self.count})")
+        start = HEADER_SIZE + index * self.board_size
+        # A bytes copy of one board, so no view keeps the mapping from closing
+        return self._mmap[start:start + self.board_size]
+
+    def load_board(self, index):
+        return Board(self.width, self.height, self.mines, layout=self.layout(index))
+
+    def close(self):
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
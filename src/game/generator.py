@@ -0,0 +1,161 @@
+# src/game/generator.py
+import random
+
+from .board import Board, MINE
+from src.ai.pattern_solver import PatternSolver
+
+
+def layout_from_mines(width, height, mine_positions):
+    """Board layout (0-8 = clue, MINE = mine) for a set of (x, y) mine positions."""
+    layout = bytearray(width * height)
+    for (x, y) in mine_positions:
+        layout[y * width + x] = MINE
+        for nx in (x - 1, x, x + 1):
+            for ny in (y - 1, y, y + 1):
+                if 0 <= nx < width and 0 <= ny < height and layout[ny * width + nx] != MINE:
+                    layout[ny * width + nx] += 1
+    return bytes(layout)
+
+
+def safe_zone(width, height, first_click):
+    x, y = first_click
+    return {(nx, ny) for nx in (x - 1, x, x + 1) for ny in (y - 1, y, y + 1)
+            if 0 <= nx < width and 0 <= ny < height}
+
+
+def _excluded(width, height, mines, first_click):
+    excluded = safe_zone(width, height, first_click)
+    if width * height - len(excluded) < mines:
+        # Not enough room to clear the whole neighbourhood: keep only the click safe
+        excluded = {tuple(first_click)}
+    return excluded
+
+
+def _fits(width, height, mines, layout, first_click, no_guess):
+    """Whether a layout generated for another click is also valid for first_click."""
+    if any(layout[y * width + x] == MINE for (x, y) in _excluded(width, height, mines, first_click)):
+        return False
+    return not no_guess or solve_without_guessing(width, height, layout, first_click).is_victory()
+
+
+def solve_without_guessing(width, height, layout, first_click):
+    """
+    Play the layout from first_click using only PatternSolver's forced moves.
+    Returns the board in the state where deduction got stuck (or was solved);
+    board.is_victory() tells whether no guess was needed.
+    """
+    board = Board(width, height, layout.count(MINE), layout=layout)
+    board.reveal_cell(*first_click)
+    solver = PatternSolver()
+    while not board.game_over and not board.is_victory():
+        # One clue may force a cell another clue also forces; apply each once
+        # since flag_cell toggles
+        moves = set(solver.find_forced_moves(board))
+        if not moves:
+            break
+        for act_type, x, y in moves:
+            if act_type == "reveal":
+                board.reveal_cell(x, y)
+            elif not board.grid[y][x].flagged:
+                board.flag_cell(x, y)
+    return board
+
+
+def _repair(board, mines, excluded, rng):
+    """
+    Move one mine from the stuck frontier (hidden cells next to revealed ones)
+    to a hidden cell away from it. Returns the new mine set, or None.
+    """
+    frontier = set()
+    for row in board.grid:
+        for c in row:
+            if c.revealed:
+                frontier.update((n.x, n.y) for n in board.get_neighbors(c.x, c.y)
+                                if not n.revealed and not n.flagged)
+    frontier_mines = [p for p in frontier if p in mines]
+    targets = [(c.x, c.y) for row in board.grid for c in row
+               if not c.revealed and (c.x, c.y) not in frontier
+               and (c.x, c.y) not in mines and (c.x, c.y) not in excluded]
+    if not frontier_mines or not targets:
+        return None
+    mines = set(mines)
+    mines.remove(rng.choice(frontier_mines))
+    mines.add(rng.choice(targets))
+    return mines
+
+
+def generate_layout(width, height, mines, first_click, no_guess=False, rng=None, max_attempts=50, max_repairs=20):
+    """
+    Mine layout (see Board's layout argument) where first_click and, when the
+    density allows it, its whole neighbourhood are mine-free, so the opening
+    move always uncovers an area.
+
+    no_guess: only return layouts PatternSolver can clear from first_click
+    without guessing. Stuck layouts are repaired by moving a frontier mine
+    elsewhere (max_repairs times) before being rejected and redrawn
+    (max_attempts times). Raises RuntimeError if nothing is accepted; this
+    happens on dense boards, where lowering the mine count is the fix.
+    """
+    rng = rng or random
+    excluded = _excluded(width, height, mines, first_click)
+    candidates = [(x, y) for y in range(height) for x in range(width) if (x, y) not in excluded]
+    if len(candidates) < mines:
+        raise ValueError(f"Cannot place {mines} mines on a {width}x{height} board")
+
+    for _ in range(max_attempts if no_guess else 1):
+        mine_set = set(rng.sample(candidates, mines))
+        layout = layout_from_mines(width, height, mine_set)
+        if not no_guess:
+            return layout
+        for _ in range(max_repairs + 1):
+            board = solve_without_guessing(width, height, layout, first_click)
+            if board.is_victory():
+                return layout
+            mine_set = _repair(board, mine_set, excluded, rng)
+            if mine_set is None:
+                break
+            layout = layout_from_mines(width, height, mine_set)
+    raise RuntimeError(f"No no-guess layout found for {width}x{height} with {mines} mines")
+
+
+class LayoutCache:
+    """
+    Keeps accepted layouts per (width, height, mines, no_guess).
+    Until a key holds max_per_key layouts every request generates a new one.
+    After that, a request first tries up to max_tries cached layouts that fit
+    its first click: the click's safe zone holds no mine and, for no_guess,
+    the board can be solved from that click without guessing. Only if none
+    fits does it generate a new layout. So the (expensive) no-guess search
+    mostly stops running, whichever cell is clicked first.
+    Reused layouts make games dependent on each other; callers running
+    statistical comparisons should keep max_per_key above the number of games.
+    save()/load() keep a key's layouts in a BoardCorpus file so later runs and
+    other workers can reuse them.
+    """
+    def __init__(self, max_per_key=1000, rng=None, max_tries=20):
+        self.max_per_key = max_per_key
+        self.max_tries = max_tries
+        self.rng = rng or random.Random()
+        self.layouts = {}
+
+    def layout(self, width, height, mines, first_click, no_guess=False):
+        cached = self.layouts.setdefault((width, height, mines, no_guess), [])
+        if len(cached) >= self.max_per_key:
+            for layout in self.rng.sample(cached, min(len(cached), self.max_tries)):
+                if _fits(width, height, mines, layout, first_click, no_guess):
+                    return layout
+        layout = generate_layout(width, height, mines, first_click, no_guess, self.rng)
+        if len(cached) < self.max_per_key:
+            cached.append(layout)
+        return layout
+
+    def save(self, filename, width, height, mines, no_guess=False):
+        from .corpus import write_layouts
+        write_layouts(filename, width, height, mines, self.layouts.get((width, height, mines, no_guess), []))
+
+    def load(self, filename, no_guess=False):
+        """Add the layouts of a corpus file saved for this mode."""
+        from .corpus import BoardCorpus
+        with BoardCorpus(filename) as corpus:
+            cached = self.layouts.setdefault((corpus.width, corpus.height, corpus.mines, no_guess), [])
+            cached.extend(corpus.layout(i) for i in range(len(corpus)))
@@ -0,0 +1,263 @@
+# src/metrics/aggregator.py
+import json
+import math
+
+
+class RunningStats:
+    """
+    Welford running mean/variance. Memory is constant no matter how many
+    values are pushed, and two instances can be merged (Chan et al.) so
+    per-worker stats can be combined at the end of a run.
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self):
+        # Sample variance; 0.0 until we have two values
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2,
+                'std': self.std, 'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, d):
+        stats = cls()
+        stats.count = d['count']
+        stats.mean = d['mean']
+        stats.m2 = d['m2']
+        stats.min = d['min']
+        stats.max = d['max']
+        return stats
+
+
+class FixedHistogram:
+    """
+    Histogram with fixed, equal-width bins over [low, high).
+    Values outside the range go to underflow/overflow counters.
+    """
+    def __init__(self, low, high, bins=20):
+        self.low = low
+        self.high = high
+        self.bins = bins
+        self.counts = [0] * bins
+        self.underflow = 0
+        self.overflow = 0
+
+    def update(self, value):
+        if value < self.low:
+            self.underflow += 1
+        elif value >= self.high:
+            self.overflow += 1
+        else:
+            idx = int((value - self.low) / (self.high - self.low) * self.bins)
+            self.counts[min(idx, self.bins - 1)] += 1
+
+    def merge(self, other):
+        if (self.low, self.high, self.bins) != (other.low, other.high, other.bins):
+            raise ValueError(f"Cannot merge histograms over [{other.low}, {other.high}) x {other.bins} "
+                             f"into [{self.low}, {self.high}) x {self.bins}")
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+
+    def to_dict(self):
+        return {'low': self.low, 'high': self.high, 'bins': self.bins,
+                'counts': self.counts, 'underflow': self.underflow, 'overflow': self.overflow}
+
+    @classmethod
+    def from_dict(cls, d):
+        hist = cls(d['low'], d['high'], d['bins'])
+        hist.counts = list(d['counts'])
+        hist.underflow = d['underflow']
+        hist.overflow = d['overflow']
+        return hist
+
+
+class WinRate:
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+
+    def update(self, won):
+        self.games += 1
+        if won:
+            self.wins += 1
+
+    def merge(self, other):
+        self.games += other.games
+        self.wins += other.wins
+
+    @property
+    def rate(self):
+        return self.wins / self.games if self.games else 0.0
+
+    def interval(self, z=1.96):
+        """
+        Wilson score interval for the win rate (default z=1.96 => ~95%).
+        Behaves well near 0 and 1, unlike the plain normal approximation.
+        """
+        return wilson_interval(self.wins, self.games, z)
+
+    def to_dict(self):
+        low, high = self.interval()
+        return {'games': self.games, 'wins': self.wins, 'rate': self.rate,
+                'ci_low': low, 'ci_high': high}
+
+    @classmethod
+    def from_dict(cls, d):
+        wr = cls()
+        wr.games = d['games']
+        wr.wins = d['wins']
+        return wr
+
+
+def wilson_interval(wins, games, z=1.96):
+    if games == 0:
+        return 0.0, 1.0
+    p = wins / games
+    denom = 1 + z * z / games
+    center = (p + z * z / (2 * games)) / denom
+    half = z * math.sqrt(p * (1 - p) / games + z * z / (4 * games * games)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+class StreamingAggregator:
+    """
+    Online aggregator for huge simulation runs.
+
+    Feed it every DynamicGR data point with update_step() and every finished
+    game with record_game(). It keeps:
+      - win counts (with Wilson confidence intervals) per label, e.g. 'ai'/'classic'
+      - Welford mean/variance of each metric per step index
+      - Welford mean/variance and a fixed-bin histogram of each metric overall
+    Memory only depends on max_steps and the number of bins, never on the number
+    of games, so it can replace concatenating per-game CSVs.
+
+    Entropy is at most one bit per hidden cell, so the default 0-50 bit range
+    only suits small boards; pass ranges={'entropy': (0.0, width * height)}
+    for bigger ones. Aggregators can only be merged if their ranges match.
+    """
+    METRICS = ('gr', 'entropy', 'complexity')
+    DEFAULT_RANGES = {
+        'gr': (0.0, 5.0),
+        'entropy': (0.0, 50.0),
+        'complexity': (0.0, 1.0),
+    }
+
+    def __init__(self, max_steps=200, bins=20, ranges=None):
+        # Steps beyond max_steps are folded into the last step bucket
+        self.max_steps = max_steps
+        self.bins = bins
+        ranges = dict(self.DEFAULT_RANGES, **(ranges or {}))
+        self.win_rates = {}
+        self.per_step = {m: [] for m in self.METRICS}
+        self.overall = {m: RunningStats() for m in self.METRICS}
+        self.histograms = {m: FixedHistogram(ranges[m][0], ranges[m][1], bins) for m in self.METRICS}
+        self.game_lengths = RunningStats()
+
+    def update_step(self, data_point):
+        """data_point: the dict returned by DynamicGR.update()"""
+        step = min(int(data_point['step']), self.max_steps - 1)
+        for m in self.METRICS:
+            value = data_point[m]
+            series = self.per_step[m]
+            while len(series) <= step:
+                series.append(RunningStats())
+            series[step].update(value)
+            self.overall[m].update(value)
+            self.histograms[m].update(value)
+
+    def record_game(self, label, won, steps=None):
+        if label not in self.win_rates:
+            self.win_rates[label] = WinRate()
+        self.win_rates[label].update(won)
+        if steps is not None:
+            self.game_lengths.update(steps)
+
+    def merge(self, other):
+        """Fold another aggregator (e.g. from a worker process) into this one."""
+        for label, wr in other.win_rates.items():
+            if label not in self.win_rates:
+                self.win_rates[label] = WinRate()
+            self.win_rates[label].merge(wr)
+        for m in self.METRICS:
+            series = self.per_step[m]
+            for step, stats in enumerate(other.per_step[m]):
+                while len(series) <= step:
+                    series.append(RunningStats())
+                series[step].merge(stats)
+            self.overall[m].merge(other.overall[m])
+            self.histograms[m].merge(other.histograms[m])
+        self.game_lengths.merge(other.game_lengths)
+
+    def summary(self):
+        return {
+            'max_steps': self.max_steps,
+            'bins': self.bins,
+            'win_rates': {label: wr.to_dict() for label, wr in self.win_rates.items()},
+            'game_lengths': self.game_lengths.to_dict(),
+            'overall': {m: s.to_dict() for m, s in self.overall.items()},
+            'per_step': {m: [s.to_dict() for s in series] for m, series in self.per_step.items()},
+            'histograms': {m: h.to_dict() for m, h in self.histograms.items()},
+        }
+
+    def save_summary(self, filename):
+        with open(filename, 'w') as f:
+            json.dump(self.summary(), f)
+
+    @classmethod
+    def from_summary(cls, summary):
+        agg = cls(summary['max_steps'], summary['bins'])
+        agg.win_rates = {label: WinRate.from_dict(d) for label, d in summary['win_rates'].items()}
+        agg.game_lengths = RunningStats.from_dict(summary['game_lengths'])
+        for m in cls.METRICS:
+            agg.overall[m] = RunningStats.from_dict(summary['overall'][m])
+            agg.per_step[m] = [RunningStats.from_dict(d) for d in summary['per_step'][m]]
+            agg.histograms[m] = FixedHistogram.from_dict(summary['histograms'][m])
+        return agg
+
+
+def load_summary(filename):
+    """
+    Load a summary written by StreamingAggregator.save_summary().
+    Returns the plain dict, which is what the notebooks need; use
+    StreamingAggregator.from_summary() to keep aggregating on top of it.
+    """
+    with open(filename, 'r') as f:
+        return json.load(f)
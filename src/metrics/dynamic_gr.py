@@ -22,6 +22,28 @@ class DynamicGR:
             if p > 0 and p < 1:
                 entropy += -(p*math.log2(p) + (1-p)*math.log2(1-p))
 
+        return self._record(step, complexity, goal_progress, entropy, revealed_safe)
+
+    def update_explored(self, board, step, probabilities):
+        """
+        Same metrics for a ChunkedBoard, restricted to the touched chunks:
+        complexity and goal progress are relative to the explored area, and
+        entropy only sums the cells in `probabilities` (the frontier), so
+        nothing outside the explored area is visited.
+        """
+        cells, mines, revealed_safe, hidden = board.explored_stats()
+        complexity = hidden / cells if cells > 0 else 0.0
+        safe_cells = cells - mines
+        goal_progress = revealed_safe / safe_cells if safe_cells > 0 else 0
+
+        entropy = 0.0
+        for p in probabilities.values():
+            if p > 0 and p < 1:
+                entropy += -(p*math.log2(p) + (1-p)*math.log2(1-p))
+
+        return self._record(step, complexity, goal_progress, entropy, revealed_safe)
+
+    def _record(self, step, complexity, goal_progress, entropy, revealed_safe):
         # Psychological metrics: acceleration & jerk
         self.reveals_history.append(revealed_safe)
         acc, jerk = self._compute_psychological_metrics()
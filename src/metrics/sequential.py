@@ -0,0 +1,114 @@
+# src/metrics/sequential.py
+import math
+
+from .aggregator import WinRate
+
+
+class SequentialComparison:
+    """
+    Sequential early-stopping comparison of two win rates (AI vs. classic).
+
+    Games are played in pairs (one AI game, one classic game). Two stopping
+    rules run side by side:
+      - Wald's SPRT on the discordant pairs (exactly one side won). Under
+        H0 both policies are equally good, so the AI wins a discordant pair
+        with p = 0.5; under H1 it wins with p = p1.
+      - A precision rule: stop once the confidence interval of the win-rate
+        difference (Newcombe's hybrid Wilson interval) is narrower than
+        +/- precision.
+    max_games bounds the number of pairs in case neither rule fires.
+    """
+    def __init__(self, alpha=0.05, beta=0.05, p1=0.6, precision=0.05, min_games=10, max_games=1000, z=1.96):
+        if not (0 < alpha < 1 and 0 < beta < 1):
+            raise ValueError(f"alpha and beta must be in (0, 1), got {alpha} and {beta}")
+        if not 0.5 < p1 < 1:
+            raise ValueError(f"p1 must be in (0.5, 1), got {p1}")
+        if min_games > max_games:
+            raise ValueError(f"min_games ({min_games}) is larger than max_games ({max_games})")
+        self.alpha = alpha
+        self.beta = beta
+        self.p1 = p1
+        self.precision = precision
+        self.min_games = min_games
+        self.max_games = max_games
+        self.z = z
+
+        self.upper = math.log((1 - beta) / alpha)
+        self.lower = math.log(beta / (1 - alpha))
+        self.llr_ai_win = math.log(p1 / 0.5)
+        self.llr_classic_win = math.log((1 - p1) / 0.5)
+
+        self.ai = WinRate()
+        self.classic = WinRate()
+        self.llr = 0.0
+        self.decision = None  # 'ai_better', 'ai_not_better', 'precision' or 'max_games'
+
+    def update(self, ai_won, classic_won):
+        self.ai.update(ai_won)
+        self.classic.update(classic_won)
+        if ai_won and not classic_won:
+            self.llr += self.llr_ai_win
+        elif classic_won and not ai_won:
+            self.llr += self.llr_classic_win
+        self.decision = self._check()
+        return self.decision
+
+    @property
+    def done(self):
+        return self.decision is not None
+
+    @property
+    def pairs(self):
+        return self.ai.games
+
+    def difference_interval(self):
+        """Newcombe (1998) interval for p_ai - p_classic built from the two Wilson intervals."""
+        p_ai, p_cl = self.ai.rate, self.classic.rate
+        l_ai, u_ai = self.ai.interval(self.z)
+        l_cl, u_cl = self.classic.interval(self.z)
+        diff = p_ai - p_cl
+        low = diff - math.sqrt((p_ai - l_ai) ** 2 + (u_cl - p_cl) ** 2)
+        high = diff + math.sqrt((u_ai - p_ai) ** 2 + (p_cl - l_cl) ** 2)
+        return low, high
+
+    def _check(self):
+        if self.pairs < self.min_games:
+            return None
+        if self.llr >= self.upper:
+            return 'ai_better'
+        if self.llr <= self.lower:
+            return 'ai_not_better'
+        low, high = self.difference_interval()
+        if (high - low) / 2 <= self.precision:
+            return 'precision'
+        if self.pairs >= self.max_games:
+            return 'max_games'
+        return None
+
+    def summary(self):
+        low, high = self.difference_interval()
+        return {
+            'decision': self.decision,
+            'pairs': self.pairs,
+            'ai': self.ai.to_dict(),
+            'classic': self.classic.to_dict(),
+            'difference': self.ai.rate - self.classic.rate,
+            'difference_ci': (low, high),
+            'llr': self.llr,
+        }
+
+
+def run_sequential_experiment(play_ai, play_classic, comparison=None):
+    """
+    Play AI/classic game pairs until the comparison reaches a decision.
+    play_ai, play_classic: callables taking the pair index and returning True on a win.
+    """
+    if comparison is None:
+        comparison = SequentialComparison()
+    i = 0
+    while not comparison.done:
+        classic_won = play_classic(i)
+        ai_won = play_ai(i)
+        comparison.update(ai_won, classic_won)
+        i += 1
+    return comparison
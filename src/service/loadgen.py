@@ -0,0 +1,95 @@
+# src/service/loadgen.py
+import argparse
+import asyncio
+import json
+import time
+
+from src.metrics.aggregator import RunningStats
+
+
+async def _client(host, port, games, width, height, mines, latency, outcomes):
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def call(request):
+        start = time.perf_counter()
+        writer.write(json.dumps(request).encode() + b'\n')
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latency.update((time.perf_counter() - start) * 1000)
+        return response
+
+    try:
+        for _ in range(games):
+            state = await call({'op': 'new', 'width': width, 'height': height, 'mines': mines})
+            if not state['ok']:
+                outcomes['error'] += 1
+                continue
+            session = state['session']
+            state = await call({'op': 'move', 'session': session, 'x': width // 2, 'y': height // 2})
+            while state['ok'] and not state['over']:
+                hint = await call({'op': 'hint', 'session': session})
+                if not hint['ok']:
+                    if hint.get('error') == 'busy':
+                        # The server pushing back; back off briefly and retry
+                        outcomes['busy'] += 1
+                        await asyncio.sleep(0.01)
+                        continue
+                    # Any other failure will not go away by retrying; give up on this game
+                    state = hint
+                    break
+                if hint['best'] is None:
+                    break
+                x, y = hint['best']
+                state = await call({'op': 'move', 'session': session, 'x': x, 'y': y})
+            if not state['ok']:
+                outcomes['error'] += 1
+            else:
+                outcomes['win' if state.get('victory') else 'lose'] += 1
+            await call({'op': 'close', 'session': session})
+    finally:
+        writer.close()
+
+
+async def run_load(host='127.0.0.1', port=8765, clients=50, games=5, width=5, height=5, mines=5):
+    """
+    Open `clients` concurrent connections, each playing `games` hint-driven games.
+    Returns client-side latency stats, outcome counts and the server's metrics.
+    """
+    latency = RunningStats()
+    outcomes = {'win': 0, 'lose': 0, 'busy': 0, 'error': 0}
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, games, width, height, mines, latency, outcomes)
+                           for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b'{"op": "metrics"}\n')
+    await writer.drain()
+    server_metrics = json.loads(await reader.readline())
+    writer.close()
+    return {
+        'elapsed_s': elapsed,
+        'requests_per_s': latency.count / elapsed if elapsed > 0 else 0.0,
+        'latency_ms': latency.to_dict(),
+        'outcomes': outcomes,
+        'server': server_metrics,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator for the GameSweeper service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--games', type=int, default=5, help="games per client")
+    parser.add_argument('--width', type=int, default=5)
+    parser.add_argument('--height', type=int, default=5)
+    parser.add_argument('--mines', type=int, default=5)
+    args = parser.parse_args(argv)
+    result = asyncio.run(run_load(args.host, args.port, args.clients, args.games,
+                                  args.width, args.height, args.mines))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+# src/service/server.py
+import argparse
+import asyncio
+import functools
+import itertools
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.game.board import Board
+from src.game.generator import generate_layout
+from src.game.game_manager import GameManager
+from src.ai.bayesian import BayesianAnalyzer
+from src.ai.mdp import MDP
+from src.metrics.aggregator import RunningStats, FixedHistogram
+
+
+# CPU-heavy jobs run in the worker pool; they get a pickled copy of their argument.
+def _layout_job(params):
+    width, height, mines, first_click, no_guess = params
+    return generate_layout(width, height, mines, first_click, no_guess)
+
+
+# max_frontier bounds the exponential enumeration; bigger frontiers get the local estimate.
+def _hint_job(board, max_frontier=None):
+    probabilities = BayesianAnalyzer(max_frontier).compute_probabilities(board)
+    return [[x, y, p] for (x, y), p in probabilities.items()]
+
+
+def _mdp_job(board, max_frontier=None):
+    probabilities = BayesianAnalyzer(max_frontier).compute_probabilities(board)
+    return MDP(board, probabilities, depth=3).find_best_action()
+
+
+class ServiceError(Exception):
+    pass
+
+
+class BusyError(ServiceError):
+    """The worker pool is saturated; counted as rejected, not as an error."""
+
+
+class Metrics:
+    """Request counters plus per-op latency stats (milliseconds)."""
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0  # turned away because the worker pool was saturated
+        self.in_flight = 0  # jobs submitted to the worker pool and not finished
+        self.max_in_flight = 0
+        self.latency = {}
+        self.histogram = FixedHistogram(0.0, 1000.0, 50)
+
+    def observe(self, op, elapsed_ms):
+        if op not in self.latency:
+            self.latency[op] = RunningStats()
+        self.latency[op].update(elapsed_ms)
+        self.histogram.update(elapsed_ms)
+
+    def to_dict(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'rejected': self.rejected,
+            'in_flight': self.in_flight,
+            'max_in_flight': self.max_in_flight,
+            'latency_ms': {op: s.to_dict() for op, s in self.latency.items()},
+            'latency_histogram_ms': self.histogram.to_dict(),
+        }
+
+
+class GameService:
+    """
+    JSON-lines game service: one JSON request per line, one JSON response per line.
+
+    Requests carry an "op" and an optional "id" that is echoed back:
+      new     {width, height, mines, safe_start, no_guess} -> {session, board}
+      move    {session, x, y, action}       -> {board, over, victory}
+      state   {session}                     -> {board, over, victory}
+      hint    {session}                     -> {probabilities: [[x, y, p], ...], best: [x, y]}
+      mdp     {session}                     -> {action: [type, x, y]}
+      close   {session}                     -> {}
+      metrics {}                            -> request counts and latency stats
+    Sessions live in memory and boards are limited to max_cells cells.
+    hint/mdp and the no-guess layout search of a no_guess board's first reveal
+    run in a process pool so the event loop never blocks; once
+    max_pending jobs are in flight further ones are rejected with "busy"
+    instead of queueing without bound (backpressure). hint/mdp enumerate
+    frontiers of up to max_frontier cells exactly and estimate bigger ones
+    locally, and a job still running after job_timeout seconds fails.
+    """
+    def __init__(self, max_sessions=10000, max_pending=64, executor=None, workers=None, max_cells=1024,
+                 max_frontier=16, job_timeout=10.0):
+        self.max_sessions = max_sessions
+        self.max_pending = max_pending
+        self.max_cells = max_cells
+        self.max_frontier = max_frontier
+        self.job_timeout = job_timeout
+        self.workers = workers
+        # A pool we created is replaced if a worker dies or a job overruns;
+        # a caller's executor is left alone
+        self._owns_executor = executor is None
+        self.executor = executor or ProcessPoolExecutor(max_workers=workers)
+        self.sessions = {}
+        self.metrics = Metrics()
+        self._ids = itertools.count(1)
+        self._server = None
+        self._connections = {}  # handler task -> its StreamWriter
+
+    async def start(self, host='127.0.0.1', port=8765):
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+        # Closing a client's transport ends its readline() with EOF, so its
+        # handler finishes instead of being cancelled at loop shutdown
+        for writer in self._connections.values():
+            writer.close()
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._server:
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Longer than the stream limit; the buffered part is dropped
+                    response = self._reject_line("Request line too long")
+                else:
+                    if not line:
+                        break
+                    try:
+                        request = json.loads(line)
+                    except ValueError:  # malformed JSON or not UTF-8
+                        response = self._reject_line("Invalid JSON")
+                    else:
+                        response = await self.handle_request(request)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+    def _reject_line(self, message):
+        self.metrics.requests += 1
+        self.metrics.errors += 1
+        return {'ok': False, 'error': message}
+
+    async def handle_request(self, request):
+        start = time.perf_counter()
+        op = request.get('op') if isinstance(request, dict) else None
+        self.metrics.requests += 1
+        try:
+            handler = getattr(self, f'_op_{op}', None)
+            if handler is None:
+                raise ServiceError(f"Unknown op: {op}")
+            response = await handler(request)
+            response['ok'] = True
+        except BusyError as e:
+            # Already counted in metrics.rejected
+            response = {'ok': False, 'error': str(e)}
+        except ServiceError as e:
+            self.metrics.errors += 1
+            response = {'ok': False, 'error': str(e)}
+        except (KeyError, ValueError, TypeError) as e:
+            # Missing or malformed fields, e.g. a move without x/y
+            self.metrics.errors += 1
+            response = {'ok': False, 'error': f"Bad request: {e!r}"}
+        except Exception as e:
+            # Anything else (e.g. a crashed worker) fails this request, not the connection
+            self.metrics.errors += 1
+            response = {'ok': False, 'error': f"Internal error: {e!r}"}
+        if isinstance(request, dict) and 'id' in request:
+            response['id'] = request['id']
+        self.metrics.observe(op or 'invalid', (time.perf_counter() - start) * 1000)
+        return response
+
+    def _session(self, request):
+        gm = self.sessions.get(request.get('session'))
+        if gm is None:
+            raise ServiceError(f"Unknown session: {request.get('session')}")
+        return gm
+
+    def _state(self, gm):
+        return {
+            'board': str(gm.board).split('\n'),
+            'over': gm.is_over(),
+            'victory': gm.is_victory(),
+        }
+
+    async def _run_job(self, func, arg):
+        if self.metrics.in_flight >= self.max_pending:
+            self.metrics.rejected += 1
+            raise BusyError("busy")
+        self.metrics.in_flight += 1
+        self.metrics.max_in_flight = max(self.metrics.max_in_flight, self.metrics.in_flight)
+        executor = self.executor
+        try:
+            loop = asyncio.get_running_loop()
+            return await asyncio.wait_for(loop.run_in_executor(executor, func, arg), self.job_timeout)
+        except BrokenProcessPool:
+            # The pool is unusable from now on; start a fresh one for later requests
+            self._replace_executor(executor)
+            raise
+        except asyncio.TimeoutError:
+            # The worker keeps running the job regardless; stop it so it cannot pin the pool
+            self._replace_executor(executor, terminate=True)
+            raise ServiceError(f"Job timed out after {self.job_timeout} s")
+        finally:
+            self.metrics.in_flight -= 1
+
+    def _replace_executor(self, executor, terminate=False):
+        if not self._owns_executor or self.executor is not executor:
+            return
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        if terminate:
+            # shutdown() would let the stuck job run to the end; other jobs of
+            # this pool fail with BrokenProcessPool and get an error response
+            for process in list((getattr(executor, '_processes', None) or {}).values()):
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _op_new(self, request):
+        if len(self.sessions) >= self.max_sessions:
+            raise ServiceError("Too many sessions")
+        width = int(request.get('width', 5))
+        height = int(request.get('height', 5))
+        mines = int(request.get('mines', 5))
+        if not (0 < width and 0 < height and 0 <= mines < width * height):
+            raise ServiceError("Invalid board size")
+        if width * height > self.max_cells:
+            raise ServiceError(f"Board too large: at most {self.max_cells} cells")
+        board = Board(width, height, mines, safe_start=bool(request.get('safe_start', False)),
+                      no_guess=bool(request.get('no_guess', False)))
+        session = str(next(self._ids))
+        self.sessions[session] = GameManager(board)
+        return {'session': session, **self._state(self.sessions[session])}
+
+    async def _op_move(self, request):
+        gm = self._session(request)
+        x, y = int(request['x']), int(request['y'])
+        action = request.get('action', 'reveal')
+        if not (0 <= x < gm.board.width and 0 <= y < gm.board.height):
+            raise ServiceError("Move outside the board")
+        if action not in ("reveal", "flag"):
+            raise ServiceError(f"Unknown action: {action}")
+        board = gm.board
+        if action == "reveal" and board.mines_pending and board.no_guess and not board.game_over:
+            # The no-guess search can take seconds on big boards: run it in the pool.
+            # (A plain safe_start placement is cheap and stays in make_move.)
+            try:
+                layout = await self._run_job(_layout_job, (board.width, board.height, board.mines, (x, y), True))
+            except RuntimeError as e:
+                # No acceptable layout for this first click
+                raise ServiceError(str(e))
+            if board.mines_pending:  # another request on this session may have placed them meanwhile
+                board.apply_layout(layout)
+        gm.make_move(x, y, action)
+        return self._state(gm)
+
+    async def _op_state(self, request):
+        return self._state(self._session(request))
+
+    async def _op_hint(self, request):
+        gm = self._session(request)
+        probabilities = await self._run_job(functools.partial(_hint_job, max_frontier=self.max_frontier), gm.board)
+        best = min(probabilities, key=lambda p: p[2]) if probabilities else None
+        return {'probabilities': probabilities, 'best': best[:2] if best else None}
+
+    async def _op_mdp(self, request):
+        gm = self._session(request)
+        action = await self._run_job(functools.partial(_mdp_job, max_frontier=self.max_frontier), gm.board)
+        return {'action': list(action) if action else None}
+
+    async def _op_close(self, request):
+        self._session(request)
+        del self.sessions[request['session']]
+        return {}
+
+    async def _op_metrics(self, request):
+        return {'sessions': len(self.sessions), **self.metrics.to_dict()}
+
+
+async def serve(host, port, **kwargs):
+    service = GameService(**kwargs)
+    server = await service.start(host, port)
+    print(f"GameSweeper service listening on {host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GameSweeper JSON-lines game service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes for hint/mdp requests")
+    parser.add_argument('--max-sessions', type=int, default=10000)
+    parser.add_argument('--max-pending', type=int, default=64, help="pool jobs in flight before rejecting with 'busy'")
+    parser.add_argument('--max-cells', type=int, default=1024, help="largest board (width * height) a session may use")
+    parser.add_argument('--max-frontier', type=int, default=16,
+                        help="largest frontier hint/mdp enumerate exactly; bigger ones are estimated locally")
+    parser.add_argument('--job-timeout', type=float, default=10.0, help="seconds before a pool job is abandoned")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, workers=args.workers, max_sessions=args.max_sessions,
+                          max_pending=args.max_pending, max_cells=args.max_cells,
+                          max_frontier=args.max_frontier, job_timeout=args.job_timeout))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()